@@ -1,113 +1,449 @@
 """Dashboard operations - favorites, recents, issues for skill-manager."""
+import asyncio
+import atexit
+import contextlib
+import functools
 import json
+import mmap
 import os
+import tempfile
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
-DASHBOARD_FILE = Path(os.environ.get("HEAVEN_DATA_DIR", "/tmp/heaven_data")) / "skill_dashboard.json"
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: no cross-process lock, in-process lock only
+    fcntl = None
+
+DATA_DIR = Path(os.environ.get("HEAVEN_DATA_DIR", "/tmp/heaven_data"))
+FAVORITES_FILE = DATA_DIR / "favorites.json"
+ISSUES_FILE = DATA_DIR / "issues.json"
+RECENTLY_MADE_FILE = DATA_DIR / "recently_made.jsonl"
+RECENTLY_EQUIPPED_FILE = DATA_DIR / "recently_equipped.jsonl"
+# Pre-sharding single-file dashboard; split into the files above on first load.
+DASHBOARD_FILE = DATA_DIR / "skill_dashboard.json"
+# Sidecar flock taken around every read-modify-write of the files above.
+LOCK_FILE = DATA_DIR / ".dashboard.lock"
+RECENTS_KEEP = 50
+RECENTS_COMPACT_BYTES = 16 * 1024
+FLUSH_DELAY = 0.2
+FLUSH_MAX_DELAY = 2.0
+MMAP_THRESHOLD = 64 * 1024
+
+_flush_timer = None
+_dirty_since = None
+_flush_lock = threading.RLock()
+_file_lock_state = {"file": None, "depth": 0}
+_ts_cache = (0.0, "")
+
+def _favorites_from_disk(data):
+    """Favorites are kept as sets in memory for O(1) membership.
+
+    _fav_index maps skill_name -> set of categories so removals skip the
+    category scan; it is rebuilt with every load and never written out. A skill
+    may be favorited under several categories, hence the set.
+    """
+    skills = {cat: set(names) for cat, names in data.get("favorite_skills", {}).items()}
+    index = {}
+    for cat, names in skills.items():
+        for s in names:
+            index.setdefault(s, set()).add(cat)
+    return {
+        "favorite_skills": skills,
+        "favorite_personas": set(data.get("favorite_personas", [])),
+        "_fav_index": index,
+    }
+
+def _favorites_to_disk(data):
+    return {
+        "favorite_skills": {cat: sorted(names) for cat, names in data["favorite_skills"].items()},
+        "favorite_personas": sorted(data["favorite_personas"]),
+    }
+
+def _issues_from_disk(data):
+    issues = data.get("issues", [])
+    return {"issues": issues, "issues_next_id": data.get("issues_next_id", len(issues) + 1)}
+
+# Each shard is cached in-process and re-read only when its file changes, judged
+# by (mtime, inode): every rewrite is a rename, so the inode moves even when two
+# writes land within one mtime tick.
+# While dirty, the in-memory copy is authoritative and is not reloaded; the
+# changes are also kept in `pending` and replayed onto a fresh read of the file
+# under LOCK_FILE when written, so other processes' writes are never lost.
+_SHARDS = {
+    "favorites": {"path": FAVORITES_FILE, "from_disk": _favorites_from_disk, "to_disk": _favorites_to_disk},
+    "issues": {"path": ISSUES_FILE, "from_disk": _issues_from_disk, "to_disk": lambda data: data},
+}
+_CACHE = {name: {"data": None, "version": None, "dirty": False, "pending": []} for name in _SHARDS}
+# Tail of each recents log, same mtime rule; the deque's maxlen does the trimming.
+_RECENTS = {path: {"items": None, "mtime": 0} for path in (RECENTLY_MADE_FILE, RECENTLY_EQUIPPED_FILE)}
+
+def _loads(raw: bytes):
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _dumps(data) -> bytes:
+    if orjson:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+def _now_iso() -> str:
+    """ISO timestamp, reused for calls within the same second (burst tracking)."""
+    global _ts_cache
+    t = time.time()
+    if 0 <= t - _ts_cache[0] < 1:  # a backwards clock step must not reuse the stamp
+        return _ts_cache[1]
+    stamp = datetime.fromtimestamp(t).isoformat()
+    _ts_cache = (t, stamp)
+    return stamp
+
+def _dumps_line(obj) -> bytes:
+    if orjson:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj) + "\n").encode()
+
+def _read_file(path: Path, size: int):
+    """Parse a JSON file; large files go to orjson straight from an mmap."""
+    if orjson is None or size < MMAP_THRESHOLD:
+        return _loads(path.read_bytes())
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
+def _write_file(path: Path, payload: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write-then-rename so a crash mid-write never leaves a truncated file.
+    # The temp name is unique per writer, so concurrent processes never rename
+    # each other's half-written file.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        try:
+            mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644  # mkstemp's 0600 would hide the file from other users
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+@contextlib.contextmanager
+def _file_lock():
+    """Exclusive cross-process lock on LOCK_FILE; re-entrant within the process."""
+    with _flush_lock:
+        state = _file_lock_state
+        if state["depth"] == 0:
+            LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+            state["file"] = open(LOCK_FILE, "a")
+            if fcntl:
+                fcntl.flock(state["file"], fcntl.LOCK_EX)
+        state["depth"] += 1
+        try:
+            yield
+        finally:
+            state["depth"] -= 1
+            if state["depth"] == 0:
+                state["file"].close()  # closing the fd releases the flock
+                state["file"] = None
+
+def _migrate_legacy():
+    """Split an old skill_dashboard.json into the per-concern files, once."""
+    if not DASHBOARD_FILE.exists():
+        return
+    with _file_lock():
+        try:
+            legacy = _loads(DASHBOARD_FILE.read_bytes())
+        except FileNotFoundError:
+            return  # another process migrated it while we waited for the lock
+        shards = {
+            FAVORITES_FILE: {k: legacy[k] for k in ("favorite_skills", "favorite_personas") if k in legacy},
+            ISSUES_FILE: _issues_from_disk(legacy),
+        }
+        for path, data in shards.items():
+            if not path.exists():
+                _write_file(path, _dumps(data))
+        for key, path in (("recently_made", RECENTLY_MADE_FILE), ("recently_equipped", RECENTLY_EQUIPPED_FILE)):
+            if legacy.get(key) and not path.exists():
+                _write_file(path, b"".join(_dumps_line(r) for r in legacy[key][-RECENTS_KEEP:]))
+        os.replace(DASHBOARD_FILE, DASHBOARD_FILE.with_name(DASHBOARD_FILE.name + ".bak"))
+
+def _version(st):
+    return (st.st_mtime_ns, st.st_ino) if st else None
+
+def _load(name: str):
+    with _flush_lock:
+        return _load_locked(name)
+
+def _load_locked(name: str):
+    shard, state = _SHARDS[name], _CACHE[name]
+    if state["dirty"]:
+        return state["data"]  # pending writes win; no need to stat the file
+    if state["data"] is None:
+        _migrate_legacy()
+    try:
+        st = shard["path"].stat()
+    except FileNotFoundError:
+        if state["data"] is None:
+            state["data"] = shard["from_disk"]({})
+        return state["data"]
+    if state["data"] is None or _version(st) != state["version"]:
+        state["data"] = shard["from_disk"](_read_file(shard["path"], st.st_size))
+        state["version"] = _version(st)
+    return state["data"]
+
+def _load_favorites():
+    return _load("favorites")
+
+def _load_issues():
+    return _load("issues")
 
 def _load_dashboard():
-    if DASHBOARD_FILE.exists():
-        return json.loads(DASHBOARD_FILE.read_text())
-    return {"favorite_skills": {}, "favorite_personas": [], "recently_made": [], "recently_equipped": [], "issues": []}
+    """All dashboard state, merged; used for preloading."""
+    return {**_load_favorites(), **_load_issues()}
+
+def _apply(name: str, change) -> bool:
+    """Run `change(data)` on a shard; if it reports a change, schedule a write.
+
+    `change` must be safe to run again on a freshly loaded copy of the shard.
+    """
+    with _flush_lock:
+        if not change(_load(name)):
+            return False
+        _CACHE[name]["pending"].append(change)
+        _mark_dirty(name)
+        return True
+
+def _mark_dirty(name: str):
+    """Schedule a write; bursts of changes within FLUSH_DELAY coalesce into one,
+    but nothing waits longer than FLUSH_MAX_DELAY from the first change."""
+    global _flush_timer, _dirty_since
+    with _flush_lock:
+        _CACHE[name]["dirty"] = True
+        now = time.monotonic()
+        if _dirty_since is None:
+            _dirty_since = now
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+        delay = min(FLUSH_DELAY, max(0.0, _dirty_since + FLUSH_MAX_DELAY - now))
+        _flush_timer = threading.Timer(delay, flush)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+def _write_shard(name: str):
+    """Write a dirty shard: under the file lock, re-read the file and replay our
+    pending changes onto it, so writes from other processes are never clobbered."""
+    shard, state = _SHARDS[name], _CACHE[name]
+    path = shard["path"]
+    with _file_lock():
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            st = None
+        data = shard["from_disk"](_read_file(path, st.st_size) if st else {})
+        for change in state["pending"]:
+            change(data)
+        _write_file(path, _dumps(shard["to_disk"](data)))
+        state["data"] = data
+        state["version"] = _version(path.stat())
+    state["dirty"] = False
+    state["pending"] = []
+
+def flush():
+    """Write pending dashboard changes to disk now, e.g. on shutdown."""
+    global _flush_timer, _dirty_since
+    with _flush_lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+        _dirty_since = None
+        for name, state in _CACHE.items():
+            if state["dirty"]:
+                _write_shard(name)
 
-def _save_dashboard(data):
-    DASHBOARD_FILE.parent.mkdir(parents=True, exist_ok=True)
-    DASHBOARD_FILE.write_text(json.dumps(data, indent=2))
+atexit.register(flush)
+
+async def _load_dashboard_async():
+    return await asyncio.to_thread(_load_dashboard)
 
 # === FAVORITE SKILLS ===
 def _dashboard_fav_skills_list() -> str:
-    data = _load_dashboard()
+    data = _load_favorites()
     favs = data.get("favorite_skills", {})
     if not favs:
         return "No favorite skills yet. Use fav_skills_add to add some."
-    result = "=== Favorite Skills ===\n"
+    parts = ["=== Favorite Skills ==="]
     for cat, skills in favs.items():
-        result += f"\n[{cat}]\n"
-        for s in skills:
-            result += f"  - {s}\n"
-    return result
+        parts.append(f"\n[{cat}]")
+        parts.extend(f"  - {s}" for s in sorted(skills))
+    return "\n".join(parts)
 
 def _dashboard_fav_skills_add(skill_name: str, category: str = "general") -> str:
-    data = _load_dashboard()
-    if category not in data["favorite_skills"]:
-        data["favorite_skills"][category] = []
-    if skill_name not in data["favorite_skills"][category]:
-        data["favorite_skills"][category].append(skill_name)
-        _save_dashboard(data)
-        return f"Added '{skill_name}' to favorites under '{category}'"
-    return f"'{skill_name}' already in favorites"
+    def add(data):
+        if category in data["_fav_index"].get(skill_name, ()):
+            return False
+        data["favorite_skills"].setdefault(category, set()).add(skill_name)
+        data["_fav_index"].setdefault(skill_name, set()).add(category)
+        return True
+    if not _apply("favorites", add):
+        return f"'{skill_name}' already in favorites under '{category}'"
+    return f"Added '{skill_name}' to favorites under '{category}'"
 
 def _dashboard_fav_skills_remove(skill_name: str) -> str:
-    data = _load_dashboard()
-    for cat, skills in data["favorite_skills"].items():
-        if skill_name in skills:
-            skills.remove(skill_name)
-            _save_dashboard(data)
-            return f"Removed '{skill_name}' from favorites"
-    return f"'{skill_name}' not found in favorites"
+    def remove(data):
+        cats = data["_fav_index"].pop(skill_name, None)
+        for cat in cats or ():
+            data["favorite_skills"][cat].discard(skill_name)
+        return bool(cats)
+    if not _apply("favorites", remove):
+        return f"'{skill_name}' not found in favorites"
+    return f"Removed '{skill_name}' from favorites"
 
 # === FAVORITE PERSONAS ===
 def _dashboard_fav_personas_list() -> str:
-    data = _load_dashboard()
+    data = _load_favorites()
     favs = data.get("favorite_personas", [])
     if not favs:
         return "No favorite personas yet."
-    return "=== Favorite Personas ===\n" + "\n".join(f"  - {p}" for p in favs)
+    return "=== Favorite Personas ===\n" + "\n".join(f"  - {p}" for p in sorted(favs))
 
 def _dashboard_fav_personas_add(persona_name: str) -> str:
-    data = _load_dashboard()
-    if persona_name not in data["favorite_personas"]:
-        data["favorite_personas"].append(persona_name)
-        _save_dashboard(data)
-        return f"Added '{persona_name}' to favorite personas"
-    return f"'{persona_name}' already in favorites"
+    def add(data):
+        if persona_name in data["favorite_personas"]:
+            return False
+        data["favorite_personas"].add(persona_name)
+        return True
+    if not _apply("favorites", add):
+        return f"'{persona_name}' already in favorites"
+    return f"Added '{persona_name}' to favorite personas"
 
 def _dashboard_fav_personas_remove(persona_name: str) -> str:
-    data = _load_dashboard()
-    if persona_name in data["favorite_personas"]:
-        data["favorite_personas"].remove(persona_name)
-        _save_dashboard(data)
-        return f"Removed '{persona_name}' from favorites"
-    return f"'{persona_name}' not found"
+    def remove(data):
+        if persona_name not in data["favorite_personas"]:
+            return False
+        data["favorite_personas"].discard(persona_name)
+        return True
+    if not _apply("favorites", remove):
+        return f"'{persona_name}' not found"
+    return f"Removed '{persona_name}' from favorites"
 
 # === RECENTS ===
+def _append_recent(path: Path, name: str):
+    """Append one event; compact to the last RECENTS_KEEP once the log grows."""
+    with _file_lock():
+        _append_recent_locked(path, name)
+
+def _append_recent_locked(path: Path, name: str):
+    items = _recents(path)
+    entry = {"name": name, "time": _now_iso()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        line = _dumps_line(entry)
+        end = f.seek(0, os.SEEK_END)
+        if end:
+            # A torn earlier append leaves no trailing newline; don't glue onto it.
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
+        size = f.tell()
+    items.append(entry)
+    if size > RECENTS_COMPACT_BYTES:
+        # Re-read the tail rather than trusting the deque: other processes append too.
+        _write_file(path, b"".join(line + b"\n" for line in _tail_lines(path, RECENTS_KEEP)))
+    _RECENTS[path]["mtime"] = path.stat().st_mtime_ns
+
+def _tail_lines(path: Path, limit: int) -> list:
+    """Return the last `limit` non-empty lines, reading backwards in 4KB blocks."""
+    if limit <= 0:
+        return []
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        while pos > 0 and buf.count(b"\n") <= limit:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    return [line for line in buf.splitlines() if line][-limit:]
+
+def _decode_recents(lines: list):
+    """Decode log lines, skipping any left torn by a crash mid-append."""
+    for line in lines:
+        try:
+            entry = _loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict) and "name" in entry and "time" in entry:
+            yield entry
+
+def _recents(path: Path) -> deque:
+    state = _RECENTS[path]
+    if state["items"] is None:
+        _migrate_legacy()  # before anything can create the log and shadow legacy recents
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime = 0
+    if state["items"] is None or mtime != state["mtime"]:
+        state["items"] = deque(_decode_recents(_tail_lines(path, RECENTS_KEEP)), maxlen=RECENTS_KEEP)
+        state["mtime"] = mtime
+    return state["items"]
+
+def _read_recents(path: Path, limit: int) -> list:
+    with _flush_lock:
+        return list(_recents(path))[-limit:] if limit > 0 else []
+
 def _dashboard_recently_made(limit: int = 10) -> str:
-    data = _load_dashboard()
-    recents = data.get("recently_made", [])[-limit:]
+    recents = _read_recents(RECENTLY_MADE_FILE, limit)
     if not recents:
         return "No recently made skills tracked."
     return "=== Recently Made ===\n" + "\n".join(f"  - {r['name']} ({r['time']})" for r in recents)
 
 def _dashboard_recently_equipped(limit: int = 10) -> str:
-    data = _load_dashboard()
-    recents = data.get("recently_equipped", [])[-limit:]
+    recents = _read_recents(RECENTLY_EQUIPPED_FILE, limit)
     if not recents:
         return "No recently equipped items tracked."
     return "=== Recently Equipped ===\n" + "\n".join(f"  - {r['name']} ({r['time']})" for r in recents)
 
 def track_made(skill_name: str):
-    data = _load_dashboard()
-    data["recently_made"].append({"name": skill_name, "time": datetime.now().isoformat()})
-    data["recently_made"] = data["recently_made"][-50:]
-    _save_dashboard(data)
+    _append_recent(RECENTLY_MADE_FILE, skill_name)
 
 def track_equipped(name: str):
-    data = _load_dashboard()
-    data["recently_equipped"].append({"name": name, "time": datetime.now().isoformat()})
-    data["recently_equipped"] = data["recently_equipped"][-50:]
-    _save_dashboard(data)
+    _append_recent(RECENTLY_EQUIPPED_FILE, name)
 
 # === ISSUES ===
 def _dashboard_create_issue(title: str, body: str, tags: str = "") -> str:
-    data = _load_dashboard()
-    issue = {"id": f"issue_{len(data['issues'])+1}", "title": title, "body": body, "tags": tags.split(",") if tags else [], "created": datetime.now().isoformat()}
-    data["issues"].append(issue)
-    _save_dashboard(data)
+    issue = {"id": None, "title": title, "body": body, "tags": [t.strip() for t in (tags or "").split(",") if t.strip()], "created": _now_iso()}
+    def create(data):
+        issue["id"] = f"issue_{data['issues_next_id']}"
+        data["issues_next_id"] += 1
+        data["issues"].append(dict(issue))
+        return True
+    with _flush_lock:
+        _apply("issues", create)
+        # Written now rather than debounced: the id must be final before it's
+        # reported, and a replay onto another process's write may renumber it.
+        _write_shard("issues")
     return f"Created issue: {issue['id']} - {title}"
 
 def _dashboard_review_issues(issue_id: str = "") -> str:
-    data = _load_dashboard()
+    data = _load_issues()
     issues = data.get("issues", [])
     if not issues:
         return "No issues."
@@ -115,5 +451,25 @@ def _dashboard_review_issues(issue_id: str = "") -> str:
         return "=== Issues ===\n" + "\n".join(f"[{i['id']}] {i['title']} ({i['created'][:10]})" for i in issues)
     for i in issues:
         if i["id"] == issue_id:
-            return f"=== {i['title']} ===\nID: {i['id']}\nTags: {', '.join(i['tags'])}\nCreated: {i['created']}\n\n{i['body']}"
+            return "\n".join([f"=== {i['title']} ===", f"ID: {i['id']}", f"Tags: {', '.join(i['tags'])}", f"Created: {i['created']}", "", i["body"]])
     return f"Issue '{issue_id}' not found"
+
+# === ASYNC ENTRY POINTS ===
+# The dashboard family registers these (is_async) so TreeShell awaits them and
+# the file I/O runs in a worker thread instead of on the MCP event loop.
+def _in_thread(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return wrapper
+
+_dashboard_fav_skills_list_async = _in_thread(_dashboard_fav_skills_list)
+_dashboard_fav_skills_add_async = _in_thread(_dashboard_fav_skills_add)
+_dashboard_fav_skills_remove_async = _in_thread(_dashboard_fav_skills_remove)
+_dashboard_fav_personas_list_async = _in_thread(_dashboard_fav_personas_list)
+_dashboard_fav_personas_add_async = _in_thread(_dashboard_fav_personas_add)
+_dashboard_fav_personas_remove_async = _in_thread(_dashboard_fav_personas_remove)
+_dashboard_recently_made_async = _in_thread(_dashboard_recently_made)
+_dashboard_recently_equipped_async = _in_thread(_dashboard_recently_equipped)
+_dashboard_create_issue_async = _in_thread(_dashboard_create_issue)
+_dashboard_review_issues_async = _in_thread(_dashboard_review_issues)
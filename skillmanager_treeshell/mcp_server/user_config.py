@@ -0,0 +1,50 @@
+"""User config discovery shared by the MCP servers."""
+import os
+
+HINT_FILE = '.skillmanager_config_hint'
+
+
+def find_user_config(heaven_data_dir: str, library_prefix: str) -> str:
+    """Find user config directory for this library in HEAVEN_DATA_DIR."""
+    try:
+        if not os.path.exists(heaven_data_dir):
+            return None
+        heaven_data_dir = os.path.abspath(heaven_data_dir)
+        # Path found by a previous run, so warm restarts skip the directory scan.
+        hint_file = os.path.join(heaven_data_dir, HINT_FILE)
+        try:
+            with open(hint_file) as f:
+                hinted = f.read().strip()
+            if _is_own_config_dir(hinted, heaven_data_dir, library_prefix):
+                return os.path.abspath(hinted)
+        except (OSError, ValueError):
+            pass
+        with os.scandir(heaven_data_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(library_prefix) and entry.is_dir():
+                    configs_path = os.path.join(entry.path, 'configs')
+                    if os.path.exists(configs_path):
+                        try:
+                            with open(hint_file, 'w') as f:
+                                f.write(configs_path)
+                        except OSError:
+                            pass
+                        return configs_path
+        return None
+    except Exception:
+        return None
+
+
+def _is_own_config_dir(path: str, heaven_data_dir: str, library_prefix: str) -> bool:
+    """Only trust a hint that points at <heaven_data_dir>/<prefix...>/configs.
+
+    A copied or moved data dir can carry a hint for some other tree.
+    """
+    path = os.path.abspath(path)
+    return (
+        os.path.commonpath([path, heaven_data_dir]) == heaven_data_dir
+        and os.path.basename(path) == 'configs'
+        and os.path.dirname(os.path.dirname(path)) == heaven_data_dir
+        and os.path.basename(os.path.dirname(path)).startswith(library_prefix)
+        and os.path.isdir(path)
+    )
@@ -2,93 +2,26 @@
 """
 Skill Manager MCP Server - TreeShell interface for three-tier skill architecture
 """
+import asyncio
 import json
 import logging
 import os
 import traceback
 from enum import Enum
-from typing import Sequence
+from typing import Final, Sequence
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 from mcp.shared.exceptions import McpError
 
-from skillmanager_treeshell import SkillManagerTreeShell
-from heaven_tree_repl import render_response
+from skillmanager_treeshell.dashboard_operations import _load_dashboard_async
+from skillmanager_treeshell.mcp_server.user_config import find_user_config
 
 logger = logging.getLogger(__name__)
 
 
-class TreeShellTools(str, Enum):
-    RUN_CONVERSATION_SHELL = "run_conversation_shell"
-
-
-class SkillManagerMCPServer:
-    """MCP Server for Skill Manager TreeShell"""
-
-    def __init__(self):
-        self.shell = None
-
-    def _find_user_config(self, heaven_data_dir: str, library_prefix: str) -> str:
-        """Find user config directory for this library in HEAVEN_DATA_DIR."""
-        try:
-            if not os.path.exists(heaven_data_dir):
-                return None
-            for item in os.listdir(heaven_data_dir):
-                if item.startswith(library_prefix):
-                    item_path = os.path.join(heaven_data_dir, item)
-                    if os.path.isdir(item_path):
-                        configs_path = os.path.join(item_path, 'configs')
-                        if os.path.exists(configs_path):
-                            return configs_path
-            return None
-        except Exception:
-            return None
-
-    async def run_conversation_shell(self, command: str) -> dict:
-        if not self.shell:
-            try:
-                heaven_data = os.getenv("HEAVEN_DATA_DIR", "/tmp/heaven_data")
-                os.environ["HEAVEN_DATA_DIR"] = heaven_data
-                os.makedirs(heaven_data, exist_ok=True)
-                user_config_path = self._find_user_config(heaven_data, "skillmanager_treeshell")
-                self.shell = SkillManagerTreeShell(user_config_path=user_config_path)
-            except Exception as e:
-                logger.error(f"Shell initialization failed: {traceback.format_exc()}")
-                return {
-                    "success": False,
-                    "error": f"Shell failed to initialize: {e}"
-                }
-
-        try:
-            result = await self.shell.handle_command(command)
-            rendered_output = render_response(result)
-
-            return {
-                "success": True,
-                "command": command,
-                "rendered_output": rendered_output,
-                "raw_result": result
-            }
-        except Exception as e:
-            logger.error(f"Command execution failed: {traceback.format_exc()}")
-            return {
-                "success": False,
-                "error": f"Error executing command '{command}': {str(e)}"
-            }
-
-
-async def serve() -> None:
-    server = Server("skill-manager-treeshell")
-    shell_server = SkillManagerMCPServer()
-
-    @server.list_tools()
-    async def list_tools() -> list[Tool]:
-        return [
-            Tool(
-                name=TreeShellTools.RUN_CONVERSATION_SHELL.value,
-                description="""Skill Manager - Three-tier skill architecture: global catalog, equipped state, skillsets.
+_TOOL_DESCRIPTION: Final[str] = """Skill Manager - Three-tier skill architecture: global catalog, equipped state, skillsets.
 
 ## What is a Skill?
 A skill is a PACKAGE (directory) containing:
@@ -150,19 +83,99 @@ Commands:
 - 'nav' - Show tree structure
 - 'jump <coordinate>' - Navigate to node (e.g., 'jump list_skills')
 - '<coordinate>.exec {"args": "values"}' - Jump and execute (e.g., 'equip.exec {"name": "my-skill"}')
-- 'exec {"args"}' - Execute current node""",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "command": {
-                            "type": "string",
-                            "description": "TreeShell command: 'nav' to see tree, 'jump <id>' to navigate, '<id>.exec {\"arg\": \"value\"}' to execute"
-                        }
-                    },
-                    "required": ["command"]
+- 'exec {"args"}' - Execute current node"""
+
+_INPUT_SCHEMA: Final[dict] = {
+    "type": "object",
+    "properties": {
+        "command": {
+            "type": "string",
+            "description": "TreeShell command: 'nav' to see tree, 'jump <id>' to navigate, '<id>.exec {\"arg\": \"value\"}' to execute"
+        }
+    },
+    "required": ["command"]
+}
+
+
+class TreeShellTools(str, Enum):
+    RUN_CONVERSATION_SHELL = "run_conversation_shell"
+
+
+# Built once; list_tools hands back the same instance on every call.
+_TOOL: Final[Tool] = Tool(
+    name=TreeShellTools.RUN_CONVERSATION_SHELL.value,
+    description=_TOOL_DESCRIPTION,
+    inputSchema=_INPUT_SCHEMA
+)
+
+
+class SkillManagerMCPServer:
+    """MCP Server for Skill Manager TreeShell"""
+
+    def __init__(self):
+        self.shell = None
+        self._warmup = None
+
+    def _find_user_config(self, heaven_data_dir: str, library_prefix: str) -> str:
+        """Find user config directory for this library in HEAVEN_DATA_DIR."""
+        return find_user_config(heaven_data_dir, library_prefix)
+
+    def _init_shell(self):
+        heaven_data = os.getenv("HEAVEN_DATA_DIR", "/tmp/heaven_data")
+        os.environ["HEAVEN_DATA_DIR"] = heaven_data
+        os.makedirs(heaven_data, exist_ok=True)
+        user_config_path = self._find_user_config(heaven_data, "skillmanager_treeshell")
+        # Deferred so the process can answer the MCP handshake before heaven_tree_repl loads.
+        from skillmanager_treeshell import SkillManagerTreeShell
+        self.shell = SkillManagerTreeShell(user_config_path=user_config_path)
+
+    async def _warm_up(self):
+        await asyncio.to_thread(self._init_shell)
+        await _load_dashboard_async()
+
+    async def run_conversation_shell(self, command: str) -> dict:
+        if self._warmup is not None:
+            try:
+                await self._warmup
+            except Exception:
+                logger.error(f"Shell warm-up failed: {traceback.format_exc()}")
+            self._warmup = None
+        if not self.shell:
+            try:
+                self._init_shell()
+            except Exception as e:
+                logger.error(f"Shell initialization failed: {traceback.format_exc()}")
+                return {
+                    "success": False,
+                    "error": f"Shell failed to initialize: {e}"
                 }
-            )
-        ]
+
+        try:
+            from heaven_tree_repl import render_response
+            result = await self.shell.handle_command(command)
+            rendered_output = render_response(result)
+
+            return {
+                "success": True,
+                "command": command,
+                "rendered_output": rendered_output,
+                "raw_result": result
+            }
+        except Exception as e:
+            logger.error(f"Command execution failed: {traceback.format_exc()}")
+            return {
+                "success": False,
+                "error": f"Error executing command '{command}': {str(e)}"
+            }
+
+
+async def serve() -> None:
+    server = Server("skill-manager-treeshell")
+    shell_server = SkillManagerMCPServer()
+
+    @server.list_tools()
+    async def list_tools() -> list[Tool]:
+        return [_TOOL]
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict) -> Sequence[TextContent]:
@@ -188,11 +201,15 @@ Commands:
             logger.error(f"Tool call failed: {traceback.format_exc()}")
             raise ValueError(f"Error processing TreeShell operation: {str(e)}")
 
+    # Build the shell and load the dashboard in the background while the stdio
+    # handshake proceeds; the first tool call waits for it. SKILL_SHELL_WARMUP=0 opts out.
+    if os.getenv("SKILL_SHELL_WARMUP", "1") != "0":
+        shell_server._warmup = asyncio.create_task(shell_server._warm_up())
+
     options = server.create_initialization_options()
     async with stdio_server() as (read_stream, write_stream):
         await server.run(read_stream, write_stream, options)
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(serve())
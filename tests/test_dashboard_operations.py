@@ -0,0 +1,80 @@
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+
+MODULE = "skillmanager_treeshell.dashboard_operations"
+
+
+def _fresh_module(data_dir):
+    """Import dashboard_operations against `data_dir` with empty caches."""
+    os.environ["HEAVEN_DATA_DIR"] = str(data_dir)
+    sys.modules.pop(MODULE, None)
+    return importlib.import_module(MODULE)
+
+
+def _worker(data_dir, worker, count):
+    ops = _fresh_module(data_dir)
+    ids = []
+    for i in range(count):
+        ops._dashboard_fav_personas_add(f"w{worker}_{i}")
+        if i % 10 == 0:
+            ids.append(ops._dashboard_create_issue(f"w{worker}_{i}", "body").split()[2])
+        ops.flush()
+    return ids
+
+
+def test_concurrent_processes_lose_no_writes(tmp_path):
+    workers, count = 3, 100
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        reported = pool.starmap(_worker, [(str(tmp_path), w, count) for w in range(workers)])
+
+    ops = _fresh_module(tmp_path)
+    personas = ops._load_favorites()["favorite_personas"]
+    assert len(personas) == workers * count
+    issue_ids = [issue["id"] for issue in ops._load_issues()["issues"]]
+    reported = [i for ids in reported for i in ids]
+    assert len(issue_ids) == len(set(issue_ids)) == len(reported)
+    assert sorted(issue_ids) == sorted(reported)
+
+
+def _migrate_worker(data_dir):
+    return _fresh_module(data_dir)._load_favorites()["favorite_personas"]
+
+
+def test_concurrent_processes_migrate_legacy_once(tmp_path):
+    legacy = {"favorite_skills": {}, "favorite_personas": ["p1", "p2"], "issues": [], "issues_next_id": 1}
+    (tmp_path / "skill_dashboard.json").write_text(json.dumps(legacy))
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        results = pool.map(_migrate_worker, [str(tmp_path)] * 4)
+
+    assert all(sorted(r) == ["p1", "p2"] for r in results)
+    assert not (tmp_path / "skill_dashboard.json").exists()
+    assert (tmp_path / "skill_dashboard.json.bak").exists()
+
+
+def test_fav_skill_in_several_categories(tmp_path):
+    ops = _fresh_module(tmp_path)
+    assert ops._dashboard_fav_skills_add("s", "a").startswith("Added")
+    assert ops._dashboard_fav_skills_add("s", "b").startswith("Added")
+    assert "already" in ops._dashboard_fav_skills_add("s", "a")
+    ops.flush()
+
+    favs = _fresh_module(tmp_path)._load_favorites()["favorite_skills"]
+    assert favs["a"] == favs["b"] == {"s"}
+    ops = _fresh_module(tmp_path)
+    ops._dashboard_fav_skills_remove("s")
+    ops.flush()
+    favs = _fresh_module(tmp_path)._load_favorites()["favorite_skills"]
+    assert not favs["a"] and not favs["b"]
+
+
+def test_now_iso_follows_backward_clock_step(tmp_path, monkeypatch):
+    ops = _fresh_module(tmp_path)
+    monkeypatch.setattr(ops.time, "time", lambda: 1_000_000.0)
+    first = ops._now_iso()
+    monkeypatch.setattr(ops.time, "time", lambda: 1_000_000.5)
+    assert ops._now_iso() == first
+    monkeypatch.setattr(ops.time, "time", lambda: 999_000.0)
+    assert ops._now_iso() != first